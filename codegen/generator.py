@@ -7,6 +7,8 @@ Supports whitelisting and unified tools that work across platforms.
 
 from __future__ import annotations
 
+import argparse
+import functools
 import json
 import re
 from pathlib import Path
@@ -58,25 +60,236 @@ UNIFIED_INPUT_SCHEMA = {
 }
 
 
+# Static blocks shared by every generated registry file. They are assembled
+# once at import time and spliced into each output instead of being rebuilt
+# line by line for every file.
+_REGISTRY_PREAMBLE: tuple[str, ...] = (
+    "from __future__ import annotations",
+    "",
+    "from typing import Any, Awaitable, Callable, Dict, List",
+    "import asyncio",
+    "import os",
+    "import json",
+    "import httpx",
+    "from mcp import types",
+    "",
+    "TOOL_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[List[types.TextContent]]]] = {}",
+    "TOOL_SCHEMAS: Dict[str, Dict[str, Any]] = {}",
+    "TOOL_DESCRIPTIONS: Dict[str, str] = {}",
+    "",
+)
+
+_HTTP_HELPERS: tuple[str, ...] = (
+    "# One client per module so connections and TLS sessions are reused across calls",
+    "_HTTP_CLIENT: httpx.AsyncClient | None = None",
+    "_HTTP_CLIENT_KEY: tuple[Any, ...] | None = None",
+    "_HTTP_CLIENTS_CLOSING: set[asyncio.Task[None]] = set()",
+    "",
+    "def _get_http_client() -> httpx.AsyncClient:",
+    "    # A client is bound to the event loop it first ran on, so rebuild it when the loop",
+    "    # or the connection settings change",
+    "    global _HTTP_CLIENT, _HTTP_CLIENT_KEY",
+    '    verify = os.getenv("VERIFY_SSL", "true").lower() == "true"',
+    '    timeout = float(os.getenv("API_TIMEOUT", "30"))',
+    "    loop = asyncio.get_running_loop()",
+    "    key = (loop, verify, timeout)",
+    "    if _HTTP_CLIENT is None or _HTTP_CLIENT_KEY != key:",
+    "        if _HTTP_CLIENT is not None and _HTTP_CLIENT_KEY is not None and _HTTP_CLIENT_KEY[0] is loop:",
+    "            # Same loop, new settings: close the old pool without blocking this call",
+    "            task = loop.create_task(_HTTP_CLIENT.aclose())",
+    "            _HTTP_CLIENTS_CLOSING.add(task)",
+    "            task.add_done_callback(_HTTP_CLIENTS_CLOSING.discard)",
+    "        _HTTP_CLIENT = httpx.AsyncClient(timeout=timeout, verify=verify, limits=httpx.Limits(max_keepalive_connections=32))",
+    "        _HTTP_CLIENT_KEY = key",
+    "    return _HTTP_CLIENT",
+    "",
+    "async def aclose_http_client() -> None:",
+    "    global _HTTP_CLIENT, _HTTP_CLIENT_KEY",
+    "    if _HTTP_CLIENT is not None and _HTTP_CLIENT_KEY is not None and _HTTP_CLIENT_KEY[0] is asyncio.get_running_loop():",
+    "        await _HTTP_CLIENT.aclose()",
+    "    _HTTP_CLIENT = None",
+    "    _HTTP_CLIENT_KEY = None",
+    "",
+    "class _PathParams(dict):",
+    "    # Leave placeholders without a value untouched in the URL",
+    "    def __missing__(self, key: str) -> str:",
+    '        return "{" + key + "}"',
+    "",
+    "def _build_url(base_url: str, route: str, path_params: Dict[str, Any] | None) -> str:",
+    "    if path_params:",
+    "        route = route.format_map(_PathParams(path_params))",
+    "    return base_url + route",
+    "",
+)
+
+_SANITIZE_HEADERS_BODY: tuple[str, ...] = (
+    "    result: Dict[str, str] = {}",
+    "    if headers:",
+    "        for k, v in headers.items():",
+    "            if v is None:",
+    "                continue",
+    "            result[str(k)] = str(v)",
+)
+
+_SANITIZE_QUERY: tuple[str, ...] = (
+    "def _sanitize_query(query: Dict[str, Any] | None) -> Dict[str, Any]:",
+    "    return {} if query is None else dict(query)",
+    "",
+)
+
+_PLATFORM_BASE_URL: Dict[str, tuple[str, ...]] = {
+    "xsiam": (
+        "def _get_base_url() -> str:",
+        '    return os.getenv("XSIAM_API_URL", "https://api-yourfqdn")',
+        "",
+    ),
+    "xsoar": (
+        "def _get_base_url() -> str:",
+        '    return os.getenv("XSOAR_API_URL", "https://your-xsoar-instance.com")',
+        "",
+    ),
+}
+
+_PLATFORM_AUTH: Dict[str, tuple[str, ...]] = {
+    "xsiam": (
+        "    # Add XSIAM auth headers if not provided",
+        '    api_key = os.getenv("XSIAM_API_KEY")',
+        '    api_key_id = os.getenv("XSIAM_API_KEY_ID")',
+        '    if api_key and "Authorization" not in result:',
+        '        result["Authorization"] = api_key',
+        '    if api_key_id and "x-xdr-auth-id" not in result:',
+        '        result["x-xdr-auth-id"] = api_key_id',
+    ),
+    "xsoar": (
+        "    # Add XSOAR auth header if not provided",
+        '    api_key = os.getenv("XSOAR_API_KEY")',
+        '    if api_key and "Authorization" not in result:',
+        '        result["Authorization"] = api_key',
+    ),
+}
+
+_PLATFORM_HANDLER: tuple[str, ...] = (
+    "def _make_handler(method: str, route: str) -> Callable[[Dict[str, Any]], Awaitable[List[types.TextContent]]]:",
+    "    async def handler(arguments: Dict[str, Any]) -> List[types.TextContent]:",
+    '        path = arguments.get("path")',
+    '        query = arguments.get("query")',
+    '        headers = arguments.get("headers")',
+    '        body = arguments.get("body")',
+    "        base_url = _get_base_url()",
+    "        url = _build_url(base_url, route, path)",
+    "        try:",
+    "            resp = await _get_http_client().request(method=method, url=url, params=_sanitize_query(query), headers=_sanitize_headers(headers), json=body)",
+    "            text = resp.text",
+    "            try:",
+    "                data = resp.json()",
+    "                text = json.dumps(data)",
+    "            except Exception:",
+    "                pass",
+    "            return [types.TextContent(type='text', text=text)]",
+    "        except Exception as e:",
+    "            return [types.TextContent(type='text', text=f'ERROR: {e}')]",
+    "    return handler",
+    "",
+)
+
+_UNIFIED_HELPERS: tuple[str, ...] = (
+    "def _get_base_url(platform: str) -> str:",
+    '    if platform == "xsiam":',
+    '        return os.getenv("XSIAM_API_URL", "https://api-yourfqdn")',
+    "    else:",
+    '        return os.getenv("XSOAR_API_URL", "https://your-xsoar-instance.com")',
+    "",
+    *_HTTP_HELPERS,
+    "def _sanitize_headers(headers: Dict[str, Any] | None, platform: str) -> Dict[str, str]:",
+    *_SANITIZE_HEADERS_BODY,
+    "    # Add XSIAM-specific auth headers if needed",
+    '    if platform == "xsiam":',
+    *("    " + line for line in _PLATFORM_AUTH["xsiam"][1:]),
+    '    elif platform == "xsoar":',
+    *("    " + line for line in _PLATFORM_AUTH["xsoar"][1:]),
+    "    return result",
+    "",
+    *_SANITIZE_QUERY,
+    "def _make_unified_handler(routes: Dict[str, tuple[str, str]]) -> Callable[[Dict[str, Any]], Awaitable[List[types.TextContent]]]:",
+    "    async def handler(arguments: Dict[str, Any]) -> List[types.TextContent]:",
+    '        platform = arguments.get("platform", "xsoar")',
+    '        path = arguments.get("path")',
+    '        query = arguments.get("query")',
+    '        headers = arguments.get("headers")',
+    '        body = arguments.get("body")',
+    "        base_url = _get_base_url(platform)",
+    "        ",
+    "        # Select route and method based on platform",
+    '        route, method = routes["xsiam" if platform == "xsiam" else "xsoar"]',
+    "        ",
+    "        url = _build_url(base_url, route, path)",
+    "        headers = _sanitize_headers(headers, platform)",
+    "        try:",
+    "            resp = await _get_http_client().request(method=method, url=url, params=_sanitize_query(query), headers=headers, json=body)",
+    "            text = resp.text",
+    "            try:",
+    "                data = resp.json()",
+    "                text = json.dumps(data)",
+    "            except Exception:",
+    "                pass",
+    "            return [types.TextContent(type='text', text=text)]",
+    "        except Exception as e:",
+    "            return [types.TextContent(type='text', text=f'ERROR: {e}')]",
+    "    return handler",
+    "",
+)
+
+
+_RE_ROUTE_CHARS = re.compile(r"[{}<>:]")
+_RE_CAMEL_WORD = re.compile("([^_])([A-Z][a-z]+)")
+_RE_CAMEL_BOUNDARY = re.compile("([a-z0-9])([A-Z])")
+_RE_WHITESPACE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=4096)
 def to_snake_case(name: str) -> str:
     name = name.replace("-", "_").replace("/", "_")
-    name = re.sub(r"[{}<>:]", "", name)
-    s1 = re.sub("([^_])([A-Z][a-z]+)", r"\1_\2", name)
-    return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
+    name = _RE_ROUTE_CHARS.sub("", name)
+    s1 = _RE_CAMEL_WORD.sub(r"\1_\2", name)
+    return _RE_CAMEL_BOUNDARY.sub(r"\1_\2", s1).lower()
 
 
 def clean_description(text: str | None) -> str:
     if not text:
         return ""
     text = text.replace("\r", " ").replace("\n", " ")
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _RE_WHITESPACE.sub(" ", text).strip()
     return text
 
 
 def load_whitelist(whitelist_path: Path) -> Dict[str, Any]:
     """Load the whitelist configuration."""
     with open(whitelist_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+        whitelist: Dict[str, Any] = json.load(f)
+    return whitelist
+
+
+def load_spec(spec_path: Path) -> Dict[str, Any]:
+    """Load a JSON or YAML OpenAPI spec, reusing the parsed copy while the file is unchanged."""
+    st = spec_path.stat()
+    return _load_spec_cached(str(spec_path.resolve()), st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_spec_cached(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    spec: Dict[str, Any]
+    if path.endswith((".yaml", ".yml")):
+        # PyYAML is only needed for YAML specs, so JSON-only runs stay stdlib-only
+        import yaml
+
+        # CSafeLoader is missing when PyYAML was built without libyaml
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with open(path, "rb") as f:
+            spec = yaml.load(f, Loader=loader)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            spec = json.load(f)
+    return spec
 
 
 def find_operation_in_spec(spec: Dict[str, Any], route: str, method: str, operation_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
@@ -106,7 +319,13 @@ def find_operation_in_spec(spec: Dict[str, Any], route: str, method: str, operat
 def generate_unified_tools_file(whitelist: Dict[str, Any], xsiam_spec: Dict[str, Any], xsoar_spec: Dict[str, Any], output_dir: Path) -> None:
     """Generate unified tools that work across both platforms."""
     output_file = output_dir / "generated_unified_tools.py"
+    output_file.write_text(_render_unified_tools(whitelist), encoding="utf-8")
     
+    print(f"Generated {output_file} with {len(whitelist.get('unified', {}))} unified tools")
+
+
+def _render_unified_tools(whitelist: Dict[str, Any]) -> str:
+    """Render the unified tools registry module source."""
     lines: List[str] = []
     lines.append('"""')
     lines.append("Auto-generated MCP registries for unified tools (XSOAR and XSIAM).")
@@ -115,62 +334,10 @@ def generate_unified_tools_file(whitelist: Dict[str, Any], xsiam_spec: Dict[str,
     lines.append("DO NOT EDIT THIS FILE MANUALLY - generated by codegen/generator.py")
     lines.append('"""')
     lines.append("")
-    lines.append("from __future__ import annotations")
-    lines.append("")
-    lines.append("from typing import Any, Awaitable, Callable, Dict, List")
-    lines.append("import os")
-    lines.append("import json")
-    lines.append("import httpx")
-    lines.append("from mcp import types")
-    lines.append("")
-    lines.append("TOOL_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[List[types.TextContent]]]] = {}")
-    lines.append("TOOL_SCHEMAS: Dict[str, Dict[str, Any]] = {}")
-    lines.append("TOOL_DESCRIPTIONS: Dict[str, str] = {}")
-    lines.append("")
+    lines.extend(_REGISTRY_PREAMBLE)
     lines.append("UNIFIED_INPUT_SCHEMA = " + repr(UNIFIED_INPUT_SCHEMA))
     lines.append("")
-    lines.append("def _get_base_url(platform: str) -> str:")
-    lines.append('    if platform == "xsiam":')
-    lines.append('        return os.getenv("XSIAM_API_URL", "https://api-yourfqdn")')
-    lines.append('    else:')
-    lines.append('        return os.getenv("XSOAR_API_URL", "https://your-xsoar-instance.com")')
-    lines.append("")
-    lines.append("def _get_http_client() -> httpx.AsyncClient:")
-    lines.append('    verify = os.getenv("VERIFY_SSL", "true").lower() == "true"')
-    lines.append('    timeout = float(os.getenv("API_TIMEOUT", "30"))')
-    lines.append("    return httpx.AsyncClient(timeout=timeout, verify=verify)")
-    lines.append("")
-    lines.append("def _build_url(base_url: str, route: str, path_params: Dict[str, Any] | None) -> str:")
-    lines.append("    url = base_url + route")
-    lines.append("    if path_params:")
-    lines.append('        for k, v in path_params.items():')
-    lines.append('            url = url.replace("{" + k + "}", str(v))')
-    lines.append("    return url")
-    lines.append("")
-    lines.append("def _sanitize_headers(headers: Dict[str, Any] | None, platform: str) -> Dict[str, str]:")
-    lines.append("    result: Dict[str, str] = {}")
-    lines.append("    if headers:")
-    lines.append("        for k, v in headers.items():")
-    lines.append("            if v is None:")
-    lines.append("                continue")
-    lines.append("            result[str(k)] = str(v)")
-    lines.append("    # Add XSIAM-specific auth headers if needed")
-    lines.append('    if platform == "xsiam":')
-    lines.append('        api_key = os.getenv("XSIAM_API_KEY")')
-    lines.append('        api_key_id = os.getenv("XSIAM_API_KEY_ID")')
-    lines.append('        if api_key and "Authorization" not in result:')
-    lines.append('            result["Authorization"] = api_key')
-    lines.append('        if api_key_id and "x-xdr-auth-id" not in result:')
-    lines.append('            result["x-xdr-auth-id"] = api_key_id')
-    lines.append('    elif platform == "xsoar":')
-    lines.append('        api_key = os.getenv("XSOAR_API_KEY")')
-    lines.append('        if api_key and "Authorization" not in result:')
-    lines.append('            result["Authorization"] = api_key')
-    lines.append("    return result")
-    lines.append("")
-    lines.append("def _sanitize_query(query: Dict[str, Any] | None) -> Dict[str, Any]:")
-    lines.append("    return {} if query is None else dict(query)")
-    lines.append("")
+    lines.extend(_UNIFIED_HELPERS)
     
     unified_tools = whitelist.get("unified", {})
     
@@ -184,68 +351,39 @@ def generate_unified_tools_file(whitelist: Dict[str, Any], xsiam_spec: Dict[str,
         xsiam_route = xsiam_config.get("route")
         xsiam_method = xsiam_config.get("method", "POST")
         
-        # Generate unified handler
-        handler_name = f"_make_unified_handler_{tool_name}"
-        lines.append(f"def {handler_name}() -> Callable[[Dict[str, Any]], Awaitable[List[types.TextContent]]]:")
-        lines.append("    async def handler(arguments: Dict[str, Any]) -> List[types.TextContent]:")
-        lines.append('        platform = arguments.get("platform", "xsoar")')
-        lines.append('        path = arguments.get("path")')
-        lines.append('        query = arguments.get("query")')
-        lines.append('        headers = arguments.get("headers")')
-        lines.append('        body = arguments.get("body")')
-        lines.append("        base_url = _get_base_url(platform)")
-        lines.append("        ")
-        lines.append("        # Select route and method based on platform")
-        lines.append(f'        if platform == "xsiam":')
-        lines.append(f'            route = {json.dumps(xsiam_route)}')
-        lines.append(f'            method = {json.dumps(xsiam_method)}')
-        lines.append(f'        else:')
-        lines.append(f'            route = {json.dumps(xsoar_route)}')
-        lines.append(f'            method = {json.dumps(xsoar_method)}')
-        lines.append("        ")
-        lines.append("        url = _build_url(base_url, route, path)")
-        lines.append("        headers = _sanitize_headers(headers, platform)")
-        lines.append("        try:")
-        lines.append("            async with _get_http_client() as client:")
-        lines.append("                resp = await client.request(method=method, url=url, params=_sanitize_query(query), headers=headers, json=body)")
-        lines.append("                text = resp.text")
-        lines.append("                try:")
-        lines.append("                    data = resp.json()")
-        lines.append("                    text = json.dumps(data)")
-        lines.append("                except Exception:")
-        lines.append("                    pass")
-        lines.append("            return [types.TextContent(type='text', text=text)]")
-        lines.append("        except Exception as e:")
-        lines.append("            return [types.TextContent(type='text', text=f'ERROR: {e}')]")
-        lines.append("    return handler")
-        lines.append("")
+        # Each tool only contributes its routes; the handler logic is shared
+        routes = {"xsiam": (xsiam_route, xsiam_method), "xsoar": (xsoar_route, xsoar_method)}
         
         # Register the tool
         tool_display_name = tool_name
-        lines.append(f"TOOL_HANDLERS[{json.dumps(tool_display_name)}] = {handler_name}()")
-        lines.append(f"TOOL_SCHEMAS[{json.dumps(tool_display_name)}] = UNIFIED_INPUT_SCHEMA")
-        lines.append(f"TOOL_DESCRIPTIONS[{json.dumps(tool_display_name)}] = {json.dumps(description)}")
+        lines.append(f"TOOL_HANDLERS[{tool_display_name!r}] = _make_unified_handler({routes!r})")
+        lines.append(f"TOOL_SCHEMAS[{tool_display_name!r}] = UNIFIED_INPUT_SCHEMA")
+        lines.append(f"TOOL_DESCRIPTIONS[{tool_display_name!r}] = {description!r}")
         lines.append("")
     
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines) + "\n")
-    
-    print(f"Generated {output_file} with {len(unified_tools)} unified tools")
+    return "\n".join(lines) + "\n"
 
 
 def generate_platform_tools_file(spec_path: Path, output_dir: Path, whitelist: Dict[str, Any], platform: str) -> None:
     """Generate platform-specific tools filtered by whitelist."""
-    # Load the spec
-    with open(spec_path, "r", encoding="utf-8") as f:
-        spec = json.load(f)
-    
     output_file = output_dir / f"generated_{platform}_tools.py"
+    operations, missing = _find_platform_operations(load_spec(spec_path), whitelist, platform)
+    for route, method, operation_id in missing:
+        print(f"Warning: Operation not found in spec: {route} {method} ({operation_id})")
+    
+    output_file.write_text(_render_platform_tools(operations, platform, spec_path.name), encoding="utf-8")
     
+    print(f"Generated {output_file} with {len(operations)} tools")
+
+
+def _find_platform_operations(spec: Dict[str, Any], whitelist: Dict[str, Any], platform: str) -> tuple[List[Dict[str, Any]], List[tuple[Any, Any, Any]]]:
+    """Resolve whitelisted operations; also return (route, method, operationId) for misses."""
     # Get whitelisted operations for this platform
     platform_whitelist = whitelist.get(platform, {})
     
     # Prepare operations from whitelist
     operations: List[Dict[str, Any]] = []
+    missing: List[tuple[Any, Any, Any]] = []
     for tool_name, tool_config in platform_whitelist.items():
         route = tool_config.get("route")
         method = tool_config.get("method", "POST")
@@ -257,97 +395,36 @@ def generate_platform_tools_file(spec_path: Path, output_dir: Path, whitelist: D
             op["description"] = tool_config.get("description", "")
             operations.append(op)
         else:
-            print(f"Warning: Operation not found in spec: {route} {method} ({operation_id})")
+            missing.append((route, method, operation_id))
     
+    return operations, missing
+
+
+def _render_platform_tools(operations: List[Dict[str, Any]], platform: str, spec_name: str) -> str:
+    """Render a platform registry module source from already-resolved operations."""
     # Build Python file
     lines: List[str] = []
     lines.append('"""')
     lines.append(f"Auto-generated MCP registries for {platform.upper()}.")
-    lines.append(f"Generated from OpenAPI specification: {spec_path.name}")
+    lines.append(f"Generated from OpenAPI specification: {spec_name}")
     lines.append("Filtered by whitelist configuration")
     lines.append("")
     lines.append("DO NOT EDIT THIS FILE MANUALLY - generated by codegen/generator.py")
     lines.append('"""')
     lines.append("")
-    lines.append("from __future__ import annotations")
-    lines.append("")
-    lines.append("from typing import Any, Awaitable, Callable, Dict, List")
-    lines.append("import os")
-    lines.append("import json")
-    lines.append("import httpx")
-    lines.append("from mcp import types")
-    lines.append("")
-    lines.append("TOOL_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[List[types.TextContent]]]] = {}")
-    lines.append("TOOL_SCHEMAS: Dict[str, Dict[str, Any]] = {}")
-    lines.append("TOOL_DESCRIPTIONS: Dict[str, str] = {}")
-    lines.append("")
+    lines.extend(_REGISTRY_PREAMBLE)
     lines.append("COMMON_INPUT_SCHEMA = " + repr(COMMON_INPUT_SCHEMA))
     lines.append("")
-    lines.append("def _get_base_url() -> str:")
-    if platform == "xsiam":
-        lines.append('    return os.getenv("XSIAM_API_URL", "https://api-yourfqdn")')
-    else:
-        lines.append('    return os.getenv("XSOAR_API_URL", "https://your-xsoar-instance.com")')
-    lines.append("")
-    lines.append("def _get_http_client() -> httpx.AsyncClient:")
-    lines.append('    verify = os.getenv("VERIFY_SSL", "true").lower() == "true"')
-    lines.append('    timeout = float(os.getenv("API_TIMEOUT", "30"))')
-    lines.append("    return httpx.AsyncClient(timeout=timeout, verify=verify)")
-    lines.append("")
-    lines.append("def _build_url(base_url: str, route: str, path_params: Dict[str, Any] | None) -> str:")
-    lines.append("    url = base_url + route")
-    lines.append("    if path_params:")
-    lines.append('        for k, v in path_params.items():')
-    lines.append('            url = url.replace("{" + k + "}", str(v))')
-    lines.append("    return url")
-    lines.append("")
+    flavor = "xsiam" if platform == "xsiam" else "xsoar"
+    lines.extend(_PLATFORM_BASE_URL[flavor])
+    lines.extend(_HTTP_HELPERS)
     lines.append("def _sanitize_headers(headers: Dict[str, Any] | None) -> Dict[str, str]:")
-    lines.append("    result: Dict[str, str] = {}")
-    lines.append("    if headers:")
-    lines.append("        for k, v in headers.items():")
-    lines.append("            if v is None:")
-    lines.append("                continue")
-    lines.append("            result[str(k)] = str(v)")
-    if platform == "xsiam":
-        lines.append("    # Add XSIAM auth headers if not provided")
-        lines.append('    api_key = os.getenv("XSIAM_API_KEY")')
-        lines.append('    api_key_id = os.getenv("XSIAM_API_KEY_ID")')
-        lines.append('    if api_key and "Authorization" not in result:')
-        lines.append('        result["Authorization"] = api_key')
-        lines.append('    if api_key_id and "x-xdr-auth-id" not in result:')
-        lines.append('        result["x-xdr-auth-id"] = api_key_id')
-    else:
-        lines.append("    # Add XSOAR auth header if not provided")
-        lines.append('    api_key = os.getenv("XSOAR_API_KEY")')
-        lines.append('    if api_key and "Authorization" not in result:')
-        lines.append('        result["Authorization"] = api_key')
+    lines.extend(_SANITIZE_HEADERS_BODY)
+    lines.extend(_PLATFORM_AUTH[flavor])
     lines.append("    return result")
     lines.append("")
-    lines.append("def _sanitize_query(query: Dict[str, Any] | None) -> Dict[str, Any]:")
-    lines.append("    return {} if query is None else dict(query)")
-    lines.append("")
-    lines.append("def _make_handler(method: str, route: str) -> Callable[[Dict[str, Any]], Awaitable[List[types.TextContent]]]:")
-    lines.append("    async def handler(arguments: Dict[str, Any]) -> List[types.TextContent]:")
-    lines.append('        path = arguments.get("path")')
-    lines.append('        query = arguments.get("query")')
-    lines.append('        headers = arguments.get("headers")')
-    lines.append('        body = arguments.get("body")')
-    lines.append("        base_url = _get_base_url()")
-    lines.append("        url = _build_url(base_url, route, path)")
-    lines.append("        try:")
-    lines.append("            async with _get_http_client() as client:")
-    lines.append("                resp = await client.request(method=method, url=url, params=_sanitize_query(query), headers=_sanitize_headers(headers), json=body)")
-    lines.append("                text = resp.text")
-    lines.append("                try:")
-    lines.append("                    data = resp.json()")
-    lines.append("                    text = json.dumps(data)")
-    lines.append("                except Exception:")
-    lines.append("                    pass")
-    lines.append("            return [types.TextContent(type='text', text=text)]")
-    lines.append("        except Exception as e:")
-    lines.append("            return [types.TextContent(type='text', text=f'ERROR: {e}')]")
-    lines.append("    return handler")
-    lines.append("")
+    lines.extend(_SANITIZE_QUERY)
+    lines.extend(_PLATFORM_HANDLER)
     
     used_names: set[str] = set()
     for op in operations:
@@ -367,22 +444,36 @@ def generate_platform_tools_file(spec_path: Path, output_dir: Path, whitelist: D
             idx += 1
         used_names.add(unique_name)
         
-        lines.append(f"TOOL_HANDLERS[{json.dumps(unique_name)}] = _make_handler({json.dumps(method)}, {json.dumps(route)})")
-        lines.append(f"TOOL_SCHEMAS[{json.dumps(unique_name)}] = COMMON_INPUT_SCHEMA")
-        lines.append(f"TOOL_DESCRIPTIONS[{json.dumps(unique_name)}] = {json.dumps(desc)}")
+        lines.append(f"TOOL_HANDLERS[{unique_name!r}] = _make_handler({method!r}, {route!r})")
+        lines.append(f"TOOL_SCHEMAS[{unique_name!r}] = COMMON_INPUT_SCHEMA")
+        lines.append(f"TOOL_DESCRIPTIONS[{unique_name!r}] = {desc!r}")
         lines.append("")
     
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines) + "\n")
-    
-    print(f"Generated {output_file} with {len(operations)} tools")
+    return "\n".join(lines) + "\n"
+
 
+def is_up_to_date(output: Path, inputs: List[Path]) -> bool:
+    """Return True if output exists and is at least as new as every input."""
+    if not output.exists():
+        return False
+    output_mtime = output.stat().st_mtime_ns
+    return all(output_mtime >= path.stat().st_mtime_ns for path in inputs)
 
-def main() -> None:
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate MCP tool registries from OpenAPI specs.")
+    parser.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        help="Skip registries that are newer than the whitelist, their spec and this generator",
+    )
+    args = parser.parse_args(argv)
+    
     project_root = Path(__file__).parent.parent
     specs_dir = project_root / "specs"
     output_dir = project_root / "server"
     whitelist_path = project_root / "codegen" / "whitelist.json"
+    generator_path = Path(__file__)
     output_dir.mkdir(exist_ok=True)
     
     # Load whitelist
@@ -400,20 +491,24 @@ def main() -> None:
         print("Error: Spec files not found")
         return
     
-    with open(xsiam_spec_path, "r", encoding="utf-8") as f:
-        xsiam_spec = json.load(f)
-    
-    with open(xsoar_spec_path, "r", encoding="utf-8") as f:
-        xsoar_spec = json.load(f)
+    def _skip(output_file: Path, inputs: List[Path]) -> bool:
+        if args.skip_unchanged and is_up_to_date(output_file, [whitelist_path, generator_path, *inputs]):
+            print(f"Skipping {output_file} (up to date)")
+            return True
+        return False
     
     # Generate unified tools
     print("Generating unified tools...")
-    generate_unified_tools_file(whitelist, xsiam_spec, xsoar_spec, output_dir)
+    if not _skip(output_dir / "generated_unified_tools.py", [xsiam_spec_path, xsoar_spec_path]):
+        xsiam_spec = load_spec(xsiam_spec_path)
+        xsoar_spec = load_spec(xsoar_spec_path)
+        generate_unified_tools_file(whitelist, xsiam_spec, xsoar_spec, output_dir)
     
     # Generate platform-specific tools
     print("\nGenerating platform-specific tools...")
-    generate_platform_tools_file(xsiam_spec_path, output_dir, whitelist, "xsiam")
-    generate_platform_tools_file(xsoar_spec_path, output_dir, whitelist, "xsoar")
+    for platform, spec_path in (("xsiam", xsiam_spec_path), ("xsoar", xsoar_spec_path)):
+        if not _skip(output_dir / f"generated_{platform}_tools.py", [spec_path]):
+            generate_platform_tools_file(spec_path, output_dir, whitelist, platform)
     
     # Count total tools
     unified_count = len(whitelist.get("unified", {}))
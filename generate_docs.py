@@ -5,56 +5,74 @@ Organizes tools by category into markdown files in the docs/ directory.
 Supports registry-based tools and unified tools.
 """
 
-import re
 import ast
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Every generated tool takes the same arguments; unified tools add a platform selector
+COMMON_TOOL_PARAMS = (
+    "path (Dict[str, Any]): Path parameters (optional)",
+    "query (Dict[str, Any]): Query parameters (optional)",
+    "headers (Dict[str, Any]): HTTP headers (optional)",
+    "body (Any): Request body (optional)",
+)
+UNIFIED_TOOL_PARAMS = (
+    "platform (str): Platform to use - 'xsoar' or 'xsiam' (required for unified tools)",
+    *COMMON_TOOL_PARAMS,
+)
+
+# is_unified -> (params summary, markdown argument list), rendered once
+TOOL_PARAM_DOCS = {
+    is_unified: (', '.join(params), '\n'.join(f"- {p}" for p in params))
+    for is_unified, params in ((False, COMMON_TOOL_PARAMS), (True, UNIFIED_TOOL_PARAMS))
+}
 
 
 def extract_tool_info_from_registry(filepath: Path) -> List[Dict[str, Any]]:
     """Extract tool information from registry-based generated file."""
-    content = filepath.read_text()
+    tree = ast.parse(filepath.read_bytes())
     
     tools = []
     
-    # Extract TOOL_DESCRIPTIONS dictionary
-    desc_pattern = r'TOOL_DESCRIPTIONS\[([^\]]+)\]\s*=\s*([^\n]+)'
+    # Collect TOOL_DESCRIPTIONS, TOOL_SCHEMAS and TOOL_HANDLERS assignments in one pass.
+    # Registrations are always module-level statements, so function bodies are skipped.
     descriptions = {}
-    for match in re.finditer(desc_pattern, content):
-        tool_name = match.group(1).strip('"\'')
-        desc = match.group(2).strip('"\'')
-        descriptions[tool_name] = desc
-    
-    # Extract TOOL_SCHEMAS to identify unified tools
-    schema_pattern = r'TOOL_SCHEMAS\[([^\]]+)\]\s*=\s*([A-Z_]+_INPUT_SCHEMA)'
     schemas = {}
-    for match in re.finditer(schema_pattern, content):
-        tool_name = match.group(1).strip('"\'')
-        schema_type = match.group(2)
-        schemas[tool_name] = schema_type
-    
-    # Get all tool names from TOOL_HANDLERS
-    handler_pattern = r'TOOL_HANDLERS\[([^\]]+)\]\s*=\s*'
-    for match in re.finditer(handler_pattern, content):
-        tool_name = match.group(1).strip('"\'')
+    handler_names = []
+    for node in tree.body:
+        if not isinstance(node, ast.Assign) or len(node.targets) != 1:
+            continue
+        target = node.targets[0]
+        if not isinstance(target, ast.Subscript) or not isinstance(target.value, ast.Name):
+            continue
+        registry = target.value.id
+        if registry not in ('TOOL_DESCRIPTIONS', 'TOOL_SCHEMAS', 'TOOL_HANDLERS'):
+            continue
+        tool_name = ast.literal_eval(target.slice)
+        if registry == 'TOOL_DESCRIPTIONS':
+            descriptions[tool_name] = ast.literal_eval(node.value)
+        elif registry == 'TOOL_SCHEMAS':
+            # Schemas are shared constants, e.g. COMMON_INPUT_SCHEMA / UNIFIED_INPUT_SCHEMA
+            if isinstance(node.value, ast.Name):
+                schemas[tool_name] = node.value.id
+        else:
+            handler_names.append(tool_name)
+    
+    for tool_name in handler_names:
         description = descriptions.get(tool_name, "No description available")
         is_unified = schemas.get(tool_name) == "UNIFIED_INPUT_SCHEMA"
         
-        # Extract parameters from schema
-        params = []
-        if is_unified:
-            params.append("platform (str): Platform to use - 'xsoar' or 'xsiam' (required for unified tools)")
-        params.append("path (Dict[str, Any]): Path parameters (optional)")
-        params.append("query (Dict[str, Any]): Query parameters (optional)")
-        params.append("headers (Dict[str, Any]): HTTP headers (optional)")
-        params.append("body (Any): Request body (optional)")
+        # Parameters follow from the schema type
+        params, args = TOOL_PARAM_DOCS[is_unified]
         
         tools.append({
             'name': tool_name,
-            'params': ', '.join(params),
+            'params': params,
             'description': description,
-            'args': '\n'.join(f"- {p}" for p in params),
+            'args': args,
             'returns': 'List[types.TextContent]: API response',
             'is_unified': is_unified
         })
@@ -62,6 +80,51 @@ def extract_tool_info_from_registry(filepath: Path) -> List[Dict[str, Any]]:
     return tools
 
 
+# Ordered (keywords, category) rules: the first rule with a keyword contained
+# in the lowercased tool name decides the category.
+XSIAM_CATEGORY_RULES = (
+    (('xql',), 'XQL Queries'),
+    (('incident',), 'Incidents'),
+    (('alert',), 'Alerts'),
+    (('endpoint', 'agent'), 'Endpoints'),
+    (('host', 'user', 'ip_address', 'ad_group', 'ou_'), 'Assets & Identity'),
+    (('violation', 'policy'), 'Policy & Compliance'),
+    (('scan', 'isolate', 'unisolate', 'quarantine', 'restore'), 'Response Actions'),
+    (('hash', 'reputation', 'ioc', 'indicator', 'bioc'), 'Threat Intelligence'),
+    (('audit', 'rbac', 'role', 'healthcheck'), 'Administration'),
+    (('playbook',), 'Playbooks'),
+    (('dashboard',), 'Dashboards'),
+    (('script',), 'Scripts'),
+)
+
+XSOAR_CATEGORY_RULES = (
+    (('script', 'automation'), 'Automations & Scripts'),
+    (('incident', 'investigation'), 'Incidents & Investigations'),
+    (('playbook',), 'Playbooks'),
+    (('indicator', 'ioc'), 'Indicators'),
+    (('integration',), 'Integrations'),
+    (('entry', 'evidence'), 'Evidence & Entries'),
+    (('user', 'role', 'api_key'), 'User Management'),
+    (('classifier', 'mapper', 'layout', 'content'), 'Content Management'),
+    (('widget', 'dashboard'), 'Dashboards & Widgets'),
+    (('get_list',), 'Lists'),
+)
+
+UNIFIED_CATEGORY_RULES = (
+    (('incident',), 'Incidents'),
+    (('script', 'automation'), 'Automations & Scripts'),
+    (('audit',), 'Logs & Audits'),
+)
+
+
+def match_category(name: str, rules: Tuple[Tuple[Tuple[str, ...], str], ...], default: str) -> str:
+    """Return the category of the first rule matching the tool name."""
+    for keywords, category in rules:
+        if any(keyword in name for keyword in keywords):
+            return category
+    return default
+
+
 def categorize_xsiam_tools(tools: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
     """Categorize XSIAM tools by functionality."""
     categories = defaultdict(list)
@@ -69,33 +132,11 @@ def categorize_xsiam_tools(tools: List[Dict[str, Any]]) -> Dict[str, List[Dict[s
     for tool in tools:
         name = tool['name'].lower()
         
-        # Categorize based on tool name
-        if 'xql' in name or ('query' in name and 'xql' in tool['description'].lower()):
+        # XQL tools are sometimes only recognizable from their description
+        if 'query' in name and 'xql' in tool['description'].lower():
             category = 'XQL Queries'
-        elif 'incident' in name:
-            category = 'Incidents'
-        elif 'alert' in name:
-            category = 'Alerts'
-        elif 'endpoint' in name or 'agent' in name:
-            category = 'Endpoints'
-        elif any(x in name for x in ['host', 'user', 'ip_address', 'ad_group', 'ou_']):
-            category = 'Assets & Identity'
-        elif 'violation' in name or 'policy' in name:
-            category = 'Policy & Compliance'
-        elif 'scan' in name or 'isolate' in name or 'unisolate' in name or 'quarantine' in name or 'restore' in name:
-            category = 'Response Actions'
-        elif 'hash' in name or 'reputation' in name or 'ioc' in name or 'indicator' in name or 'bioc' in name:
-            category = 'Threat Intelligence'
-        elif 'audit' in name or 'rbac' in name or 'role' in name or 'healthcheck' in name:
-            category = 'Administration'
-        elif 'playbook' in name:
-            category = 'Playbooks'
-        elif 'dashboard' in name:
-            category = 'Dashboards'
-        elif 'script' in name:
-            category = 'Scripts'
         else:
-            category = 'Other Operations'
+            category = match_category(name, XSIAM_CATEGORY_RULES, 'Other Operations')
         
         categories[category].append(tool)
     
@@ -107,32 +148,7 @@ def categorize_xsoar_tools(tools: List[Dict[str, Any]]) -> Dict[str, List[Dict[s
     categories = defaultdict(list)
     
     for tool in tools:
-        name = tool['name'].lower()
-        
-        # Categorize based on tool name
-        if 'script' in name or 'automation' in name:
-            category = 'Automations & Scripts'
-        elif 'incident' in name or 'investigation' in name:
-            category = 'Incidents & Investigations'
-        elif 'playbook' in name:
-            category = 'Playbooks'
-        elif 'indicator' in name or 'ioc' in name:
-            category = 'Indicators'
-        elif 'integration' in name:
-            category = 'Integrations'
-        elif 'entry' in name or 'evidence' in name:
-            category = 'Evidence & Entries'
-        elif 'user' in name or 'role' in name or 'api_key' in name:
-            category = 'User Management'
-        elif 'classifier' in name or 'mapper' in name or 'layout' in name or 'content' in name:
-            category = 'Content Management'
-        elif 'widget' in name or 'dashboard' in name:
-            category = 'Dashboards & Widgets'
-        elif 'list' in name and 'get_list' in name:
-            category = 'Lists'
-        else:
-            category = 'Other Operations'
-        
+        category = match_category(tool['name'].lower(), XSOAR_CATEGORY_RULES, 'Other Operations')
         categories[category].append(tool)
     
     return dict(categories)
@@ -143,17 +159,7 @@ def categorize_unified_tools(tools: List[Dict[str, Any]]) -> Dict[str, List[Dict
     categories = defaultdict(list)
     
     for tool in tools:
-        name = tool['name'].lower()
-        
-        if 'incident' in name:
-            category = 'Incidents'
-        elif 'script' in name or 'automation' in name:
-            category = 'Automations & Scripts'
-        elif 'audit' in name:
-            category = 'Logs & Audits'
-        else:
-            category = 'Unified Operations'
-        
+        category = match_category(tool['name'].lower(), UNIFIED_CATEGORY_RULES, 'Unified Operations')
         categories[category].append(tool)
     
     return dict(categories)
@@ -161,42 +167,50 @@ def categorize_unified_tools(tools: List[Dict[str, Any]]) -> Dict[str, List[Dict
 
 def generate_tool_doc(tool: Dict[str, Any]) -> str:
     """Generate markdown documentation for a single tool."""
-    doc = f"### `{tool['name']}`\n\n"
+    parts: List[str] = [f"### `{tool['name']}`\n\n"]
     
     if tool.get('is_unified'):
-        doc += "**Unified Tool** - Works with both XSOAR and XSIAM platforms\n\n"
+        parts.append("**Unified Tool** - Works with both XSOAR and XSIAM platforms\n\n")
     
-    doc += f"{tool['description']}\n\n"
+    parts.append(f"{tool['description']}\n\n")
     
     if tool['args'] and tool['args'] != 'No parameters required':
-        doc += "**Parameters:**\n\n"
+        parts.append("**Parameters:**\n\n")
         for arg_line in tool['args'].split('\n'):
             if arg_line.strip():
-                doc += f"{arg_line.strip()}\n"
-        doc += "\n"
+                parts.append(f"{arg_line.strip()}\n")
+        parts.append("\n")
     else:
-        doc += "**Parameters:** None\n\n"
+        parts.append("**Parameters:** None\n\n")
     
     if tool['returns']:
-        doc += f"**Returns:** {tool['returns']}\n\n"
+        parts.append(f"**Returns:** {tool['returns']}\n\n")
     
-    return doc
+    return "".join(parts)
 
 
 def generate_category_doc(category: str, tools: List[Dict[str, Any]], prefix: str) -> str:
     """Generate documentation for a category of tools."""
-    doc = f"# {category}\n\n"
-    doc += f"This section documents {len(tools)} {prefix.upper()} tools related to {category.lower()}.\n\n"
-    doc += "---\n\n"
+    parts: List[str] = [f"# {category}\n\n"]
+    parts.append(f"This section documents {len(tools)} {prefix.upper()} tools related to {category.lower()}.\n\n")
+    parts.append("---\n\n")
     
     # Sort tools alphabetically
     sorted_tools = sorted(tools, key=lambda t: t['name'])
     
     for tool in sorted_tools:
-        doc += generate_tool_doc(tool)
-        doc += "---\n\n"
+        parts.append(generate_tool_doc(tool))
+        parts.append("---\n\n")
     
-    return doc
+    return "".join(parts)
+
+
+def write_category_doc(category: str, tools: List[Dict[str, Any]], output_dir: Path, prefix: str) -> Path:
+    """Render a category page and write it to output_dir."""
+    filename = category.lower().replace(' ', '-').replace('&', 'and')
+    filepath = output_dir / f'{filename}.md'
+    filepath.write_bytes(generate_category_doc(category, tools, prefix).encode("utf-8"))
+    return filepath
 
 
 def generate_index(xsiam_categories: Dict, xsoar_categories: Dict, unified_categories: Dict) -> str:
@@ -206,53 +220,53 @@ def generate_index(xsiam_categories: Dict, xsoar_categories: Dict, unified_categ
     total_unified = sum(len(tools) for tools in unified_categories.values())
     total = total_xsiam + total_xsoar + total_unified
     
-    doc = "# Cortex MCP Tools Documentation\n\n"
-    doc += "This documentation provides detailed information about all available MCP tools for XSIAM and XSOAR.\n\n"
-    doc += f"**Total Tools:** {total}\n\n"
-    doc += f"- **Unified Tools:** {total_unified} (work with both platforms)\n"
-    doc += f"- **XSIAM Tools:** {total_xsiam}\n"
-    doc += f"- **XSOAR Tools:** {total_xsoar}\n\n"
+    parts: List[str] = ["# Cortex MCP Tools Documentation\n\n"]
+    parts.append("This documentation provides detailed information about all available MCP tools for XSIAM and XSOAR.\n\n")
+    parts.append(f"**Total Tools:** {total}\n\n")
+    parts.append(f"- **Unified Tools:** {total_unified} (work with both platforms)\n")
+    parts.append(f"- **XSIAM Tools:** {total_xsiam}\n")
+    parts.append(f"- **XSOAR Tools:** {total_xsoar}\n\n")
     
-    doc += "## 📚 Documentation Structure\n\n"
-    doc += "Tools are organized by platform and functionality:\n\n"
+    parts.append("## 📚 Documentation Structure\n\n")
+    parts.append("Tools are organized by platform and functionality:\n\n")
     
     if unified_categories:
-        doc += "### Unified Tools\n\n"
-        doc += "These tools work with both XSOAR and XSIAM platforms. Use the `platform` parameter to specify which platform to use.\n\n"
+        parts.append("### Unified Tools\n\n")
+        parts.append("These tools work with both XSOAR and XSIAM platforms. Use the `platform` parameter to specify which platform to use.\n\n")
         for category in sorted(unified_categories.keys()):
             tools = unified_categories[category]
             filename = category.lower().replace(' ', '-').replace('&', 'and')
-            doc += f"- **[{category}](unified/{filename}.md)** ({len(tools)} tools)\n"
-        doc += "\n"
+            parts.append(f"- **[{category}](unified/{filename}.md)** ({len(tools)} tools)\n")
+        parts.append("\n")
     
-    doc += "### XSIAM Tools\n\n"
+    parts.append("### XSIAM Tools\n\n")
     for category in sorted(xsiam_categories.keys()):
         tools = xsiam_categories[category]
         filename = category.lower().replace(' ', '-').replace('&', 'and')
-        doc += f"- **[{category}](xsiam/{filename}.md)** ({len(tools)} tools)\n"
+        parts.append(f"- **[{category}](xsiam/{filename}.md)** ({len(tools)} tools)\n")
     
-    doc += "\n### XSOAR Tools\n\n"
+    parts.append("\n### XSOAR Tools\n\n")
     for category in sorted(xsoar_categories.keys()):
         tools = xsoar_categories[category]
         filename = category.lower().replace(' ', '-').replace('&', 'and')
-        doc += f"- **[{category}](xsoar/{filename}.md)** ({len(tools)} tools)\n"
-    
-    doc += "\n## 🚀 Quick Start\n\n"
-    doc += "Each tool page includes:\n"
-    doc += "- **Description**: What the tool does\n"
-    doc += "- **Parameters**: What the tool expects (required/optional)\n"
-    doc += "- **Returns**: What the tool returns\n\n"
-    
-    doc += "## 📖 Using the Tools\n\n"
-    doc += "All tools follow the MCP (Model Context Protocol) standard. "
-    doc += "They are designed to be used with AI-powered IDEs like Windsurf, Cursor, and Roo Code.\n\n"
-    doc += "**Unified Tools**: Tools marked as 'Unified Tool' accept a `platform` parameter ('xsoar' or 'xsiam') "
-    doc += "to work with either platform. These tools automatically route to the correct API endpoint based on the platform.\n\n"
-    doc += "For setup instructions and examples, see:\n"
-    doc += "- [README.md](../README.md) - Setup and configuration\n"
-    doc += "- [EXAMPLES.md](../EXAMPLES.md) - Usage examples and workflows\n"
-    
-    return doc
+        parts.append(f"- **[{category}](xsoar/{filename}.md)** ({len(tools)} tools)\n")
+    
+    parts.append("\n## 🚀 Quick Start\n\n")
+    parts.append("Each tool page includes:\n")
+    parts.append("- **Description**: What the tool does\n")
+    parts.append("- **Parameters**: What the tool expects (required/optional)\n")
+    parts.append("- **Returns**: What the tool returns\n\n")
+    
+    parts.append("## 📖 Using the Tools\n\n")
+    parts.append("All tools follow the MCP (Model Context Protocol) standard. ")
+    parts.append("They are designed to be used with AI-powered IDEs like Windsurf, Cursor, and Roo Code.\n\n")
+    parts.append("**Unified Tools**: Tools marked as 'Unified Tool' accept a `platform` parameter ('xsoar' or 'xsiam') ")
+    parts.append("to work with either platform. These tools automatically route to the correct API endpoint based on the platform.\n\n")
+    parts.append("For setup instructions and examples, see:\n")
+    parts.append("- [README.md](../README.md) - Setup and configuration\n")
+    parts.append("- [EXAMPLES.md](../EXAMPLES.md) - Usage examples and workflows\n")
+    
+    return "".join(parts)
 
 
 def main():
@@ -303,34 +317,21 @@ def main():
     # Generate documentation files
     print("\nGenerating documentation files...")
     
-    # Generate unified docs
-    for category, tools in unified_categories.items():
-        filename = category.lower().replace(' ', '-').replace('&', 'and')
-        filepath = unified_dir / f'{filename}.md'
-        content = generate_category_doc(category, tools, 'unified')
-        filepath.write_text(content)
-        print(f"  Created {filepath}")
-    
-    # Generate XSIAM docs
-    for category, tools in xsiam_categories.items():
-        filename = category.lower().replace(' ', '-').replace('&', 'and')
-        filepath = xsiam_dir / f'{filename}.md'
-        content = generate_category_doc(category, tools, 'xsiam')
-        filepath.write_text(content)
-        print(f"  Created {filepath}")
-    
-    # Generate XSOAR docs
-    for category, tools in xsoar_categories.items():
-        filename = category.lower().replace(' ', '-').replace('&', 'and')
-        filepath = xsoar_dir / f'{filename}.md'
-        content = generate_category_doc(category, tools, 'xsoar')
-        filepath.write_text(content)
-        print(f"  Created {filepath}")
+    # Category pages are independent, so write them concurrently
+    jobs = [
+        *((category, tools, unified_dir, 'unified') for category, tools in unified_categories.items()),
+        *((category, tools, xsiam_dir, 'xsiam') for category, tools in xsiam_categories.items()),
+        *((category, tools, xsoar_dir, 'xsoar') for category, tools in xsoar_categories.items()),
+    ]
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        futures = [executor.submit(write_category_doc, *job) for job in jobs]
+        for future in futures:
+            print(f"  Created {future.result()}")
     
     # Generate index
     index_content = generate_index(xsiam_categories, xsoar_categories, unified_categories)
     index_path = docs_dir / 'README.md'
-    index_path.write_text(index_content)
+    index_path.write_bytes(index_content.encode("utf-8"))
     print(f"\n  Created {index_path}")
     
     print("\n✅ Documentation generation complete!")
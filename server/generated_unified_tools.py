@@ -8,6 +8,7 @@ DO NOT EDIT THIS FILE MANUALLY - generated by codegen/generator.py
 from __future__ import annotations
 
 from typing import Any, Awaitable, Callable, Dict, List
+import asyncio
 import os
 import json
 import httpx
@@ -50,18 +51,59 @@ def _get_base_url(platform: str) -> str:
         return os.getenv("XSOAR_API_URL", "https://your-xsoar-instance.com")
 
 
+# One client per module so connections and TLS sessions are reused across calls
+_HTTP_CLIENT: httpx.AsyncClient | None = None
+_HTTP_CLIENT_KEY: tuple[Any, ...] | None = None
+_HTTP_CLIENTS_CLOSING: set[asyncio.Task[None]] = set()
+
+
 def _get_http_client() -> httpx.AsyncClient:
+    # A client is bound to the event loop it first ran on, so rebuild it when the loop
+    # or the connection settings change
+    global _HTTP_CLIENT, _HTTP_CLIENT_KEY
     verify = os.getenv("VERIFY_SSL", "true").lower() == "true"
     timeout = float(os.getenv("API_TIMEOUT", "30"))
-    return httpx.AsyncClient(timeout=timeout, verify=verify)
+    loop = asyncio.get_running_loop()
+    key = (loop, verify, timeout)
+    if _HTTP_CLIENT is None or _HTTP_CLIENT_KEY != key:
+        if (
+            _HTTP_CLIENT is not None
+            and _HTTP_CLIENT_KEY is not None
+            and _HTTP_CLIENT_KEY[0] is loop
+        ):
+            # Same loop, new settings: close the old pool without blocking this call
+            task = loop.create_task(_HTTP_CLIENT.aclose())
+            _HTTP_CLIENTS_CLOSING.add(task)
+            task.add_done_callback(_HTTP_CLIENTS_CLOSING.discard)
+        _HTTP_CLIENT = httpx.AsyncClient(
+            timeout=timeout, verify=verify, limits=httpx.Limits(max_keepalive_connections=32)
+        )
+        _HTTP_CLIENT_KEY = key
+    return _HTTP_CLIENT
+
+
+async def aclose_http_client() -> None:
+    global _HTTP_CLIENT, _HTTP_CLIENT_KEY
+    if (
+        _HTTP_CLIENT is not None
+        and _HTTP_CLIENT_KEY is not None
+        and _HTTP_CLIENT_KEY[0] is asyncio.get_running_loop()
+    ):
+        await _HTTP_CLIENT.aclose()
+    _HTTP_CLIENT = None
+    _HTTP_CLIENT_KEY = None
+
+
+class _PathParams(dict):
+    # Leave placeholders without a value untouched in the URL
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
 
 
 def _build_url(base_url: str, route: str, path_params: Dict[str, Any] | None) -> str:
-    url = base_url + route
     if path_params:
-        for k, v in path_params.items():
-            url = url.replace("{" + k + "}", str(v))
-    return url
+        route = route.format_map(_PathParams(path_params))
+    return base_url + route
 
 
 def _sanitize_headers(headers: Dict[str, Any] | None, platform: str) -> Dict[str, str]:
@@ -90,9 +132,9 @@ def _sanitize_query(query: Dict[str, Any] | None) -> Dict[str, Any]:
     return {} if query is None else dict(query)
 
 
-def _make_unified_handler_get_incidents() -> (
-    Callable[[Dict[str, Any]], Awaitable[List[types.TextContent]]]
-):
+def _make_unified_handler(
+    routes: Dict[str, tuple[str, str]],
+) -> Callable[[Dict[str, Any]], Awaitable[List[types.TextContent]]]:
     async def handler(arguments: Dict[str, Any]) -> List[types.TextContent]:
         platform = arguments.get("platform", "xsoar")
         path = arguments.get("path")
@@ -102,30 +144,20 @@ def _make_unified_handler_get_incidents() -> (
         base_url = _get_base_url(platform)
 
         # Select route and method based on platform
-        if platform == "xsiam":
-            route = "/public_api/v1/incidents/get_incidents"
-            method = "POST"
-        else:
-            route = "/incidents/search"
-            method = "POST"
+        route, method = routes["xsiam" if platform == "xsiam" else "xsoar"]
 
         url = _build_url(base_url, route, path)
         headers = _sanitize_headers(headers, platform)
         try:
-            async with _get_http_client() as client:
-                resp = await client.request(
-                    method=method,
-                    url=url,
-                    params=_sanitize_query(query),
-                    headers=headers,
-                    json=body,
-                )
-                text = resp.text
-                try:
-                    data = resp.json()
-                    text = json.dumps(data)
-                except Exception:
-                    pass
+            resp = await _get_http_client().request(
+                method=method, url=url, params=_sanitize_query(query), headers=headers, json=body
+            )
+            text = resp.text
+            try:
+                data = resp.json()
+                text = json.dumps(data)
+            except Exception:
+                pass
             return [types.TextContent(type="text", text=text)]
         except Exception as e:
             return [types.TextContent(type="text", text=f"ERROR: {e}")]
@@ -133,294 +165,50 @@ def _make_unified_handler_get_incidents() -> (
     return handler
 
 
-TOOL_HANDLERS["get_incidents"] = _make_unified_handler_get_incidents()
+TOOL_HANDLERS["get_incidents"] = _make_unified_handler(
+    {
+        "xsiam": ("/public_api/v1/incidents/get_incidents", "POST"),
+        "xsoar": ("/incidents/search", "POST"),
+    }
+)
 TOOL_SCHEMAS["get_incidents"] = UNIFIED_INPUT_SCHEMA
 TOOL_DESCRIPTIONS["get_incidents"] = "Get a list of incidents filtered by various criteria"
 
-
-def _make_unified_handler_update_incident() -> (
-    Callable[[Dict[str, Any]], Awaitable[List[types.TextContent]]]
-):
-    async def handler(arguments: Dict[str, Any]) -> List[types.TextContent]:
-        platform = arguments.get("platform", "xsoar")
-        path = arguments.get("path")
-        query = arguments.get("query")
-        headers = arguments.get("headers")
-        body = arguments.get("body")
-        base_url = _get_base_url(platform)
-
-        # Select route and method based on platform
-        if platform == "xsiam":
-            route = "/public_api/v1/incidents/update_incident"
-            method = "POST"
-        else:
-            route = "/incident"
-            method = "PUT"
-
-        url = _build_url(base_url, route, path)
-        headers = _sanitize_headers(headers, platform)
-        try:
-            async with _get_http_client() as client:
-                resp = await client.request(
-                    method=method,
-                    url=url,
-                    params=_sanitize_query(query),
-                    headers=headers,
-                    json=body,
-                )
-                text = resp.text
-                try:
-                    data = resp.json()
-                    text = json.dumps(data)
-                except Exception:
-                    pass
-            return [types.TextContent(type="text", text=text)]
-        except Exception as e:
-            return [types.TextContent(type="text", text=f"ERROR: {e}")]
-
-    return handler
-
-
-TOOL_HANDLERS["update_incident"] = _make_unified_handler_update_incident()
+TOOL_HANDLERS["update_incident"] = _make_unified_handler(
+    {"xsiam": ("/public_api/v1/incidents/update_incident", "POST"), "xsoar": ("/incident", "PUT")}
+)
 TOOL_SCHEMAS["update_incident"] = UNIFIED_INPUT_SCHEMA
 TOOL_DESCRIPTIONS["update_incident"] = "Update an existing incident"
 
-
-def _make_unified_handler_get_automation_scripts() -> (
-    Callable[[Dict[str, Any]], Awaitable[List[types.TextContent]]]
-):
-    async def handler(arguments: Dict[str, Any]) -> List[types.TextContent]:
-        platform = arguments.get("platform", "xsoar")
-        path = arguments.get("path")
-        query = arguments.get("query")
-        headers = arguments.get("headers")
-        body = arguments.get("body")
-        base_url = _get_base_url(platform)
-
-        # Select route and method based on platform
-        if platform == "xsiam":
-            route = "/public_api/v1/scripts/get"
-            method = "POST"
-        else:
-            route = "/automation/search"
-            method = "POST"
-
-        url = _build_url(base_url, route, path)
-        headers = _sanitize_headers(headers, platform)
-        try:
-            async with _get_http_client() as client:
-                resp = await client.request(
-                    method=method,
-                    url=url,
-                    params=_sanitize_query(query),
-                    headers=headers,
-                    json=body,
-                )
-                text = resp.text
-                try:
-                    data = resp.json()
-                    text = json.dumps(data)
-                except Exception:
-                    pass
-            return [types.TextContent(type="text", text=text)]
-        except Exception as e:
-            return [types.TextContent(type="text", text=f"ERROR: {e}")]
-
-    return handler
-
-
-TOOL_HANDLERS["get_automation_scripts"] = _make_unified_handler_get_automation_scripts()
+TOOL_HANDLERS["get_automation_scripts"] = _make_unified_handler(
+    {"xsiam": ("/public_api/v1/scripts/get", "POST"), "xsoar": ("/automation/search", "POST")}
+)
 TOOL_SCHEMAS["get_automation_scripts"] = UNIFIED_INPUT_SCHEMA
 TOOL_DESCRIPTIONS["get_automation_scripts"] = "Get automation scripts"
 
-
-def _make_unified_handler_save_or_update_script() -> (
-    Callable[[Dict[str, Any]], Awaitable[List[types.TextContent]]]
-):
-    async def handler(arguments: Dict[str, Any]) -> List[types.TextContent]:
-        platform = arguments.get("platform", "xsoar")
-        path = arguments.get("path")
-        query = arguments.get("query")
-        headers = arguments.get("headers")
-        body = arguments.get("body")
-        base_url = _get_base_url(platform)
-
-        # Select route and method based on platform
-        if platform == "xsiam":
-            route = "/public_api/v1/scripts/insert"
-            method = "POST"
-        else:
-            route = "/automation"
-            method = "POST"
-
-        url = _build_url(base_url, route, path)
-        headers = _sanitize_headers(headers, platform)
-        try:
-            async with _get_http_client() as client:
-                resp = await client.request(
-                    method=method,
-                    url=url,
-                    params=_sanitize_query(query),
-                    headers=headers,
-                    json=body,
-                )
-                text = resp.text
-                try:
-                    data = resp.json()
-                    text = json.dumps(data)
-                except Exception:
-                    pass
-            return [types.TextContent(type="text", text=text)]
-        except Exception as e:
-            return [types.TextContent(type="text", text=f"ERROR: {e}")]
-
-    return handler
-
-
-TOOL_HANDLERS["save_or_update_script"] = _make_unified_handler_save_or_update_script()
+TOOL_HANDLERS["save_or_update_script"] = _make_unified_handler(
+    {"xsiam": ("/public_api/v1/scripts/insert", "POST"), "xsoar": ("/automation", "POST")}
+)
 TOOL_SCHEMAS["save_or_update_script"] = UNIFIED_INPUT_SCHEMA
 TOOL_DESCRIPTIONS["save_or_update_script"] = "Create or update an automation script"
 
-
-def _make_unified_handler_import_script() -> (
-    Callable[[Dict[str, Any]], Awaitable[List[types.TextContent]]]
-):
-    async def handler(arguments: Dict[str, Any]) -> List[types.TextContent]:
-        platform = arguments.get("platform", "xsoar")
-        path = arguments.get("path")
-        query = arguments.get("query")
-        headers = arguments.get("headers")
-        body = arguments.get("body")
-        base_url = _get_base_url(platform)
-
-        # Select route and method based on platform
-        if platform == "xsiam":
-            route = "/public_api/v1/scripts/insert"
-            method = "POST"
-        else:
-            route = "/automation/import"
-            method = "POST"
-
-        url = _build_url(base_url, route, path)
-        headers = _sanitize_headers(headers, platform)
-        try:
-            async with _get_http_client() as client:
-                resp = await client.request(
-                    method=method,
-                    url=url,
-                    params=_sanitize_query(query),
-                    headers=headers,
-                    json=body,
-                )
-                text = resp.text
-                try:
-                    data = resp.json()
-                    text = json.dumps(data)
-                except Exception:
-                    pass
-            return [types.TextContent(type="text", text=text)]
-        except Exception as e:
-            return [types.TextContent(type="text", text=f"ERROR: {e}")]
-
-    return handler
-
-
-TOOL_HANDLERS["import_script"] = _make_unified_handler_import_script()
+TOOL_HANDLERS["import_script"] = _make_unified_handler(
+    {"xsiam": ("/public_api/v1/scripts/insert", "POST"), "xsoar": ("/automation/import", "POST")}
+)
 TOOL_SCHEMAS["import_script"] = UNIFIED_INPUT_SCHEMA
 TOOL_DESCRIPTIONS["import_script"] = "Import an automation script"
 
-
-def _make_unified_handler_delete_automation_script() -> (
-    Callable[[Dict[str, Any]], Awaitable[List[types.TextContent]]]
-):
-    async def handler(arguments: Dict[str, Any]) -> List[types.TextContent]:
-        platform = arguments.get("platform", "xsoar")
-        path = arguments.get("path")
-        query = arguments.get("query")
-        headers = arguments.get("headers")
-        body = arguments.get("body")
-        base_url = _get_base_url(platform)
-
-        # Select route and method based on platform
-        if platform == "xsiam":
-            route = "/public_api/v1/scripts/delete"
-            method = "POST"
-        else:
-            route = "/automation/delete"
-            method = "POST"
-
-        url = _build_url(base_url, route, path)
-        headers = _sanitize_headers(headers, platform)
-        try:
-            async with _get_http_client() as client:
-                resp = await client.request(
-                    method=method,
-                    url=url,
-                    params=_sanitize_query(query),
-                    headers=headers,
-                    json=body,
-                )
-                text = resp.text
-                try:
-                    data = resp.json()
-                    text = json.dumps(data)
-                except Exception:
-                    pass
-            return [types.TextContent(type="text", text=text)]
-        except Exception as e:
-            return [types.TextContent(type="text", text=f"ERROR: {e}")]
-
-    return handler
-
-
-TOOL_HANDLERS["delete_automation_script"] = _make_unified_handler_delete_automation_script()
+TOOL_HANDLERS["delete_automation_script"] = _make_unified_handler(
+    {"xsiam": ("/public_api/v1/scripts/delete", "POST"), "xsoar": ("/automation/delete", "POST")}
+)
 TOOL_SCHEMAS["delete_automation_script"] = UNIFIED_INPUT_SCHEMA
 TOOL_DESCRIPTIONS["delete_automation_script"] = "Delete an automation script"
 
-
-def _make_unified_handler_get_audits() -> (
-    Callable[[Dict[str, Any]], Awaitable[List[types.TextContent]]]
-):
-    async def handler(arguments: Dict[str, Any]) -> List[types.TextContent]:
-        platform = arguments.get("platform", "xsoar")
-        path = arguments.get("path")
-        query = arguments.get("query")
-        headers = arguments.get("headers")
-        body = arguments.get("body")
-        base_url = _get_base_url(platform)
-
-        # Select route and method based on platform
-        if platform == "xsiam":
-            route = "/public_api/v1/audits/management_logs"
-            method = "POST"
-        else:
-            route = "/settings/audits"
-            method = "GET"
-
-        url = _build_url(base_url, route, path)
-        headers = _sanitize_headers(headers, platform)
-        try:
-            async with _get_http_client() as client:
-                resp = await client.request(
-                    method=method,
-                    url=url,
-                    params=_sanitize_query(query),
-                    headers=headers,
-                    json=body,
-                )
-                text = resp.text
-                try:
-                    data = resp.json()
-                    text = json.dumps(data)
-                except Exception:
-                    pass
-            return [types.TextContent(type="text", text=text)]
-        except Exception as e:
-            return [types.TextContent(type="text", text=f"ERROR: {e}")]
-
-    return handler
-
-
-TOOL_HANDLERS["get_audits"] = _make_unified_handler_get_audits()
+TOOL_HANDLERS["get_audits"] = _make_unified_handler(
+    {
+        "xsiam": ("/public_api/v1/audits/management_logs", "POST"),
+        "xsoar": ("/settings/audits", "GET"),
+    }
+)
 TOOL_SCHEMAS["get_audits"] = UNIFIED_INPUT_SCHEMA
 TOOL_DESCRIPTIONS["get_audits"] = "Get audit logs"
@@ -9,6 +9,7 @@ DO NOT EDIT THIS FILE MANUALLY - generated by codegen/generator.py
 from __future__ import annotations
 
 from typing import Any, Awaitable, Callable, Dict, List
+import asyncio
 import os
 import json
 import httpx
@@ -43,18 +44,59 @@ def _get_base_url() -> str:
     return os.getenv("XSOAR_API_URL", "https://your-xsoar-instance.com")
 
 
+# One client per module so connections and TLS sessions are reused across calls
+_HTTP_CLIENT: httpx.AsyncClient | None = None
+_HTTP_CLIENT_KEY: tuple[Any, ...] | None = None
+_HTTP_CLIENTS_CLOSING: set[asyncio.Task[None]] = set()
+
+
 def _get_http_client() -> httpx.AsyncClient:
+    # A client is bound to the event loop it first ran on, so rebuild it when the loop
+    # or the connection settings change
+    global _HTTP_CLIENT, _HTTP_CLIENT_KEY
     verify = os.getenv("VERIFY_SSL", "true").lower() == "true"
     timeout = float(os.getenv("API_TIMEOUT", "30"))
-    return httpx.AsyncClient(timeout=timeout, verify=verify)
+    loop = asyncio.get_running_loop()
+    key = (loop, verify, timeout)
+    if _HTTP_CLIENT is None or _HTTP_CLIENT_KEY != key:
+        if (
+            _HTTP_CLIENT is not None
+            and _HTTP_CLIENT_KEY is not None
+            and _HTTP_CLIENT_KEY[0] is loop
+        ):
+            # Same loop, new settings: close the old pool without blocking this call
+            task = loop.create_task(_HTTP_CLIENT.aclose())
+            _HTTP_CLIENTS_CLOSING.add(task)
+            task.add_done_callback(_HTTP_CLIENTS_CLOSING.discard)
+        _HTTP_CLIENT = httpx.AsyncClient(
+            timeout=timeout, verify=verify, limits=httpx.Limits(max_keepalive_connections=32)
+        )
+        _HTTP_CLIENT_KEY = key
+    return _HTTP_CLIENT
+
+
+async def aclose_http_client() -> None:
+    global _HTTP_CLIENT, _HTTP_CLIENT_KEY
+    if (
+        _HTTP_CLIENT is not None
+        and _HTTP_CLIENT_KEY is not None
+        and _HTTP_CLIENT_KEY[0] is asyncio.get_running_loop()
+    ):
+        await _HTTP_CLIENT.aclose()
+    _HTTP_CLIENT = None
+    _HTTP_CLIENT_KEY = None
+
+
+class _PathParams(dict):
+    # Leave placeholders without a value untouched in the URL
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
 
 
 def _build_url(base_url: str, route: str, path_params: Dict[str, Any] | None) -> str:
-    url = base_url + route
     if path_params:
-        for k, v in path_params.items():
-            url = url.replace("{" + k + "}", str(v))
-    return url
+        route = route.format_map(_PathParams(path_params))
+    return base_url + route
 
 
 def _sanitize_headers(headers: Dict[str, Any] | None) -> Dict[str, str]:
@@ -86,20 +128,19 @@ def _make_handler(
         base_url = _get_base_url()
         url = _build_url(base_url, route, path)
         try:
-            async with _get_http_client() as client:
-                resp = await client.request(
-                    method=method,
-                    url=url,
-                    params=_sanitize_query(query),
-                    headers=_sanitize_headers(headers),
-                    json=body,
-                )
-                text = resp.text
-                try:
-                    data = resp.json()
-                    text = json.dumps(data)
-                except Exception:
-                    pass
+            resp = await _get_http_client().request(
+                method=method,
+                url=url,
+                params=_sanitize_query(query),
+                headers=_sanitize_headers(headers),
+                json=body,
+            )
+            text = resp.text
+            try:
+                data = resp.json()
+                text = json.dumps(data)
+            except Exception:
+                pass
             return [types.TextContent(type="text", text=text)]
         except Exception as e:
             return [types.TextContent(type="text", text=f"ERROR: {e}")]
@@ -9,8 +9,9 @@ import asyncio
 import json
 import os
 import sys
+from collections import ChainMap
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, Iterator, List, Mapping
 
 from mcp import types
 from mcp.server import Server
@@ -18,6 +19,11 @@ from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.server.stdio import stdio_server
 from pydantic import AnyUrl
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 from . import generated_xsiam_tools as xsiam
 from . import generated_xsoar_tools as xsoar
 
@@ -33,25 +39,54 @@ def _log(event: str, **kwargs: Any) -> None:
     if os.getenv("CORTEXSYNAPSE_ENABLE_LOGGING", "").lower() in ("1", "true", "yes"):
         try:
             payload = {"event": event, **kwargs}
-            print(json.dumps(payload), file=sys.stderr, flush=True)
+            buffer = getattr(sys.stderr, "buffer", None)
+            if orjson is not None and buffer is not None:
+                # Flush the text layer first so lines written through it stay in order
+                sys.stderr.flush()
+                buffer.write(orjson.dumps(payload) + b"\n")
+                buffer.flush()
+            else:
+                # Compact separators match orjson so lines look the same either way
+                print(json.dumps(payload, separators=(",", ":")), file=sys.stderr, flush=True)
         except Exception:
             # Best-effort logging
             pass
 
 
-def _merge_registries() -> tuple[Dict[str, Any], Dict[str, Any], Dict[str, str]]:
-    handlers: Dict[str, Any] = {}
-    schemas: Dict[str, Any] = {}
-    descs: Dict[str, str] = {}
+def _walk_markdown(root: Path) -> Iterator[os.DirEntry[str]]:
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".md"):
+                    yield entry
+
 
+def _snapshot_docs(root: Path) -> Dict[str, tuple[Path, str, int]]:
+    # Docs are static for the lifetime of the server, so each one is read once here and
+    # the reported size always matches the text that read_resource serves
+    docs: Dict[str, tuple[Path, str, int]] = {}
+    for entry in _walk_markdown(root):
+        md = Path(entry.path)
+        data = md.read_bytes()
+        uri = f"cortexsynapse-docs://{md.relative_to(root).as_posix()}"
+        docs[uri] = (md, data.decode("utf-8"), len(data))
+    return docs
+
+
+def _merge_registries() -> tuple[Mapping[str, Any], Mapping[str, Any], Mapping[str, str]]:
     modules = [xsiam, xsoar]
     if unified:
         modules.append(unified)
 
-    for mod in modules:
-        handlers.update(mod.TOOL_HANDLERS)
-        schemas.update(mod.TOOL_SCHEMAS)
-        descs.update(mod.TOOL_DESCRIPTIONS)
+    # Chain the module registries instead of copying them. Later modules win,
+    # as they did with sequential update(), so they are searched first.
+    modules.reverse()
+    handlers = ChainMap(*(mod.TOOL_HANDLERS for mod in modules))
+    schemas = ChainMap(*(mod.TOOL_SCHEMAS for mod in modules))
+    descs = ChainMap(*(mod.TOOL_DESCRIPTIONS for mod in modules))
 
     return handlers, schemas, descs
 
@@ -62,19 +97,20 @@ async def run_server() -> None:
     TOOL_HANDLERS, TOOL_SCHEMAS, TOOL_DESCRIPTIONS = _merge_registries()
     _log("server_start", tools_count=len(TOOL_HANDLERS))
 
+    # The tool set is fixed once the registries are merged, so build it once
+    TOOLS: List[types.Tool] = [
+        types.Tool(
+            name=name,
+            description=TOOL_DESCRIPTIONS.get(name),
+            inputSchema=TOOL_SCHEMAS.get(name) or {"type": "object", "properties": {}},
+        )
+        for name in sorted(TOOL_HANDLERS.keys())
+    ]
+
     @server.list_tools()
     async def list_tools_handler() -> List[types.Tool]:
-        tools: List[types.Tool] = []
-        for name in sorted(TOOL_HANDLERS.keys()):
-            tools.append(
-                types.Tool(
-                    name=name,
-                    description=TOOL_DESCRIPTIONS.get(name),
-                    inputSchema=TOOL_SCHEMAS.get(name) or {"type": "object", "properties": {}},
-                )
-            )
-        _log("list_tools", count=len(tools))
-        return tools
+        _log("list_tools", count=len(TOOLS))
+        return TOOLS
 
     @server.call_tool()
     async def call_tool_handler(tool_name: str, arguments: Dict[str, Any]):
@@ -91,32 +127,31 @@ async def run_server() -> None:
             return [types.TextContent(type="text", text=f"ERROR: {exc}")]
 
     # Resources: expose docs markdown
-    DOCS: Dict[str, Path] = {}
     docs_root = Path(__file__).parent.parent / "docs"
-    if docs_root.exists():
-        for md in docs_root.rglob("*.md"):
-            uri = f"cortexsynapse-docs://{md.relative_to(docs_root).as_posix()}"
-            DOCS[uri] = md
+    DOCS = _snapshot_docs(docs_root) if docs_root.exists() else {}
     _log("resources_ready", resources_count=len(DOCS))
 
     @server.list_resources()
     async def list_resources_handler() -> List[types.Resource]:
         resources: List[types.Resource] = []
-        for uri, path in sorted(DOCS.items()):
-            size = path.stat().st_size if path.exists() else None
+        for uri, (path, _, size) in sorted(DOCS.items()):
             resources.append(types.Resource(uri=uri, description=path.name, mimeType="text/markdown", size=size))
         return resources
 
     @server.read_resource()
     async def read_resource_handler(uri: AnyUrl | str) -> Iterable[ReadResourceContents]:
-        path = DOCS.get(str(uri))
-        if not path:
+        entry = DOCS.get(str(uri))
+        if not entry:
             raise ValueError(f"Unknown resource: {uri}")
-        text = path.read_text(encoding="utf-8")
-        return [ReadResourceContents(content=text, mime_type="text/markdown")]
-
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, server.create_initialization_options())
+        return [ReadResourceContents(content=entry[1], mime_type="text/markdown")]
+
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, server.create_initialization_options())
+    finally:
+        for registry in (xsiam, xsoar, unified):
+            if registry is not None:
+                await registry.aclose_http_client()
 
 
 def main() -> None:
@@ -0,0 +1,19 @@
+"""
+Optional mypyc build for the code generator.
+
+Project metadata lives in pyproject.toml. Set CORTEXSYNAPSE_MYPYC=1 (with mypy
+installed in the build environment) to compile codegen/generator.py into a C
+extension; otherwise this is a plain setuptools build.
+"""
+
+import os
+
+from setuptools import setup
+
+ext_modules = []
+if os.getenv("CORTEXSYNAPSE_MYPYC", "").lower() in ("1", "true", "yes"):
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(["codegen/generator.py"])
+
+setup(ext_modules=ext_modules)
@@ -2,63 +2,57 @@
 
 from __future__ import annotations
 
-import importlib.util
-import json
+import asyncio
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from types import ModuleType
+from types import CodeType, SimpleNamespace
 
+import orjson
 import pytest
 
 from codegen.generator import (
+    _find_platform_operations,
+    _render_platform_tools,
+    _render_unified_tools,
     COMMON_INPUT_SCHEMA,
     UNIFIED_INPUT_SCHEMA,
     find_operation_in_spec,
     generate_platform_tools_file,
     generate_unified_tools_file,
+    is_up_to_date,
+    load_spec,
     load_whitelist,
     to_snake_case,
 )
 
+# Compiled generated modules keyed on (path, mtime_ns), reused across loads
+_CODE_CACHE: dict[tuple[str, int], CodeType] = {}
 
-def _load_module(path: Path) -> ModuleType:
-    spec = importlib.util.spec_from_file_location(path.stem, path)
-    module = importlib.util.module_from_spec(spec)
-    assert spec.loader  # for mypy
-    spec.loader.exec_module(module)
-    return module
 
+def _load_module(path: Path) -> SimpleNamespace:
+    key = (str(path), path.stat().st_mtime_ns)
+    code = _CODE_CACHE.get(key)
+    if code is None:
+        # optimize=2 drops docstrings and asserts; tests only read the registries
+        code = compile(path.read_bytes(), str(path), "exec", dont_inherit=True, optimize=2)
+        _CODE_CACHE[key] = code
+    # Tests only inspect the registries, so a plain namespace stands in for the module
+    namespace = {"__name__": path.stem, "__file__": str(path)}
+    exec(code, namespace)
+    return SimpleNamespace(**namespace)
 
-def test_to_snake_case_handles_mixed_names():
-    """Ensure camelCase and symbols are normalized."""
-    assert to_snake_case("ListIncidents") == "list_incidents"
-    assert to_snake_case("create-Widget/Item") == "create_widget_item"
-    assert to_snake_case("HTTPResponse2XX") == "http_response2_xx"
-
-
-def test_find_operation_in_spec_matches_route_and_method():
-    """find_operation_in_spec should locate the correct route/method pair."""
-    spec = {
-        "paths": {
-            "/items": {
-                "get": {"operationId": "listItems", "summary": "List", "description": "List items"}
-            }
-        }
-    }
 
-    op = find_operation_in_spec(spec, "/items", "GET")
-    assert op is not None
-    assert op["operationId"] == "listItems"
-    assert op["method"] == "GET"
+def _exec_source(source: str) -> SimpleNamespace:
+    namespace: dict = {"__name__": "generated"}
+    exec(compile(source, "<generated>", "exec", dont_inherit=True, optimize=2), namespace)
+    return SimpleNamespace(**namespace)
 
 
-def test_find_operation_in_spec_returns_none_for_missing_route():
-    """Non-existent paths should return None."""
-    spec = {"paths": {"/items": {"get": {"operationId": "listItems"}}}}
-    assert find_operation_in_spec(spec, "/missing", "GET") is None
-
-
-def test_generate_platform_tools_file_builds_registry(tmp_path: Path):
-    """Platform-specific generator should emit MCP registry files."""
+@pytest.fixture(scope="session")
+def platform_tools_module(tmp_path_factory: pytest.TempPathFactory) -> SimpleNamespace:
+    """Generate an XSIAM registry from a one-operation spec once per session."""
     spec = {
         "openapi": "3.0.0",
         "paths": {
@@ -71,12 +65,6 @@ def test_generate_platform_tools_file_builds_registry(tmp_path: Path):
             }
         },
     }
-
-    spec_path = tmp_path / "spec.json"
-    spec_path.write_text(json.dumps(spec))
-    output_dir = tmp_path / "out"
-    output_dir.mkdir()
-
     whitelist = {
         "xsiam": {
             "list_items": {
@@ -88,19 +76,19 @@ def test_generate_platform_tools_file_builds_registry(tmp_path: Path):
         }
     }
 
+    output_dir = tmp_path_factory.mktemp("gen")
+    spec_path = output_dir / "spec.json"
+    spec_path.write_bytes(orjson.dumps(spec))
+
     generate_platform_tools_file(spec_path, output_dir, whitelist, "xsiam")
     generated_path = output_dir / "generated_xsiam_tools.py"
     assert generated_path.exists()
-
-    module = _load_module(generated_path)
-    tool_name = "xsiam_list_items"
-    assert tool_name in module.TOOL_HANDLERS
-    assert module.TOOL_SCHEMAS[tool_name] == COMMON_INPUT_SCHEMA
-    assert module.TOOL_DESCRIPTIONS[tool_name] == "Return all items"
+    return _load_module(generated_path)
 
 
-def test_generate_unified_tools_file_builds_registry(tmp_path: Path):
-    """Unified generator should create platform-aware handlers."""
+@pytest.fixture(scope="session")
+def unified_tools_module(tmp_path_factory: pytest.TempPathFactory) -> SimpleNamespace:
+    """Generate a unified registry with a single tool once per session."""
     whitelist = {
         "unified": {
             "get_incidents": {
@@ -111,25 +99,252 @@ def test_generate_unified_tools_file_builds_registry(tmp_path: Path):
         }
     }
 
-    output_dir = tmp_path / "out"
-    output_dir.mkdir()
-
+    output_dir = tmp_path_factory.mktemp("gen")
     generate_unified_tools_file(whitelist, {}, {}, output_dir)
     generated_path = output_dir / "generated_unified_tools.py"
     assert generated_path.exists()
+    return _load_module(generated_path)
+
+
+@pytest.mark.parametrize(
+    "raw,expected",
+    [
+        ("ListIncidents", "list_incidents"),
+        ("create-Widget/Item", "create_widget_item"),
+        ("HTTPResponse2XX", "http_response2_xx"),
+    ],
+)
+def test_to_snake_case_handles_mixed_names(raw: str, expected: str):
+    """Ensure camelCase and symbols are normalized."""
+    assert to_snake_case(raw) == expected
+
+
+def test_to_snake_case_is_memoized():
+    """Repeated identifiers should be served from the cache."""
+    to_snake_case.cache_clear()
+    for _ in range(100):
+        to_snake_case("listIncidents")
+    assert to_snake_case.cache_info().hits == 99
+
+
+_ITEMS_SPEC = {
+    "paths": {
+        "/items": {
+            "get": {"operationId": "listItems", "summary": "List", "description": "List items"}
+        }
+    }
+}
+
+
+@pytest.mark.parametrize(
+    "route,method,expected_op_id",
+    [
+        ("/items", "GET", "listItems"),
+        ("/items", "get", "listItems"),
+        ("/items", "POST", None),
+        ("/missing", "GET", None),
+    ],
+)
+def test_find_operation_in_spec(route: str, method: str, expected_op_id: str | None):
+    """find_operation_in_spec should match route/method pairs and return None otherwise."""
+    op = find_operation_in_spec(_ITEMS_SPEC, route, method)
+    if expected_op_id is None:
+        assert op is None
+    else:
+        assert op is not None
+        assert op["operationId"] == expected_op_id
+        assert op["method"] == method.upper()
+
+
+def test_generate_platform_tools_file_builds_registry(platform_tools_module: SimpleNamespace):
+    """Platform-specific generator should emit MCP registry files."""
+    tool_name = "xsiam_list_items"
+    assert tool_name in platform_tools_module.TOOL_HANDLERS
+    assert platform_tools_module.TOOL_SCHEMAS[tool_name] == COMMON_INPUT_SCHEMA
+    assert platform_tools_module.TOOL_DESCRIPTIONS[tool_name] == "Return all items"
+
+
+def test_generated_build_url_fills_path_params(platform_tools_module: SimpleNamespace):
+    """Generated URL builder should substitute known path params and keep the rest."""
+    build_url = platform_tools_module._build_url
+    assert build_url("https://host", "/items/{id}", {"id": 7}) == "https://host/items/7"
+    assert build_url("https://host", "/items/{id}", {}) == "https://host/items/{id}"
+    assert build_url("https://host", "/items/{id}", {"other": 1}) == "https://host/items/{id}"
+    assert (
+        build_url("https://host", "/items/{id}/{sub}", {"sub": "x"}) == "https://host/items/{id}/x"
+    )
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive so the client pool actually reuses them
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        body = b'{"ok": 1}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def local_api(monkeypatch: pytest.MonkeyPatch):
+    """Serve a JSON response locally and point the XSIAM base URL at it."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("XSIAM_API_URL", f"http://127.0.0.1:{httpd.server_port}")
+    yield
+    httpd.shutdown()
+    httpd.server_close()
 
-    module = _load_module(generated_path)
+
+def test_generated_handler_works_across_event_loops(
+    platform_tools_module: SimpleNamespace, local_api
+):
+    """Generated handlers should work under successive event loops."""
+    handler = platform_tools_module.TOOL_HANDLERS["xsiam_list_items"]
+
+    async def call_and_close():
+        try:
+            return await handler({})
+        finally:
+            await platform_tools_module.aclose_http_client()
+
+    for _ in range(3):
+        result = asyncio.run(call_and_close())
+        assert result[0].text == '{"ok": 1}'
+
+
+def test_generated_http_client_is_rebuilt_per_event_loop(platform_tools_module: SimpleNamespace):
+    """A client cached on a finished event loop must not be reused on the next one."""
+    get_client = platform_tools_module._get_http_client
+
+    async def cache_client():
+        client = get_client()
+        # Release the pool but leave the client cached, as a finished loop would
+        await client.aclose()
+        return client
+
+    async def next_client():
+        client = get_client()
+        await platform_tools_module.aclose_http_client()
+        return client
+
+    stale = asyncio.run(cache_client())
+    assert asyncio.run(next_client()) is not stale
+
+
+def test_generated_http_client_closes_client_on_settings_change(
+    platform_tools_module: SimpleNamespace, monkeypatch: pytest.MonkeyPatch
+):
+    """Changing the timeout on the same loop should replace and close the old client."""
+    get_client = platform_tools_module._get_http_client
+
+    async def change_timeout():
+        old = get_client()
+        monkeypatch.setenv("API_TIMEOUT", "5")
+        new = get_client()
+        await asyncio.gather(*platform_tools_module._HTTP_CLIENTS_CLOSING)
+        await platform_tools_module.aclose_http_client()
+        return old, new
+
+    old, new = asyncio.run(change_timeout())
+    assert new is not old
+    assert old.is_closed
+
+
+def test_generate_unified_tools_file_builds_registry(unified_tools_module: SimpleNamespace):
+    """Unified generator should create platform-aware handlers."""
     tool_name = "get_incidents"
-    assert tool_name in module.TOOL_HANDLERS
-    assert module.TOOL_SCHEMAS[tool_name] == UNIFIED_INPUT_SCHEMA
-    assert module.TOOL_DESCRIPTIONS[tool_name] == "Fetch incidents from a platform"
+    assert tool_name in unified_tools_module.TOOL_HANDLERS
+    assert unified_tools_module.TOOL_SCHEMAS[tool_name] == UNIFIED_INPUT_SCHEMA
+    assert unified_tools_module.TOOL_DESCRIPTIONS[tool_name] == "Fetch incidents from a platform"
+
+
+def test_render_unified_tools_allows_single_platform_tools():
+    """Tools configured for one platform only should still produce importable code."""
+    whitelist = {
+        "unified": {
+            "list_widgets": {
+                "description": 'List "dashboard" widgets',
+                "xsoar": {"route": "/widgets", "method": "GET"},
+            }
+        }
+    }
+
+    module = _exec_source(_render_unified_tools(whitelist))
+    assert module.TOOL_DESCRIPTIONS["list_widgets"] == 'List "dashboard" widgets'
+
+
+def test_render_platform_tools_from_in_memory_spec():
+    """Platform registries should render without touching the filesystem."""
+    whitelist = {
+        "xsoar": {
+            "list_items": {"route": "/items", "method": "GET"},
+            "drop_items": {"route": "/items", "method": "DELETE"},
+        }
+    }
+
+    operations, missing = _find_platform_operations(_ITEMS_SPEC, whitelist, "xsoar")
+    assert missing == [("/items", "DELETE", None)]
+
+    module = _exec_source(_render_platform_tools(operations, "xsoar", "spec.json"))
+    assert list(module.TOOL_HANDLERS) == ["xsoar_list_items"]
+    assert module.TOOL_SCHEMAS["xsoar_list_items"] == COMMON_INPUT_SCHEMA
 
 
 def test_load_whitelist_reads_json(tmp_path: Path):
     """Whitelist loader should parse JSON config."""
     whitelist_path = tmp_path / "whitelist.json"
     data = {"xsoar": {"tool": {"route": "/test", "method": "GET"}}}
-    whitelist_path.write_text(json.dumps(data))
+    whitelist_path.write_bytes(orjson.dumps(data))
 
     loaded = load_whitelist(whitelist_path)
     assert loaded == data
+
+
+def test_load_spec_reuses_parsed_spec_until_file_changes(tmp_path: Path):
+    """Repeated loads of an unchanged spec should not re-parse it."""
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_bytes(orjson.dumps({"paths": {}}))
+
+    first = load_spec(spec_path)
+    assert load_spec(spec_path) is first
+
+    spec_path.write_bytes(orjson.dumps({"paths": {"/items": {}}}))
+    reloaded = load_spec(spec_path)
+    assert reloaded is not first
+    assert "/items" in reloaded["paths"]
+
+
+def test_load_spec_reads_yaml(tmp_path: Path):
+    """YAML specs should load to the same structure as JSON ones."""
+    spec_path = tmp_path / "spec.yaml"
+    spec_path.write_bytes(b"paths:\n  /items:\n    get:\n      operationId: listItems\n")
+
+    spec = load_spec(spec_path)
+    assert find_operation_in_spec(spec, "/items", "GET")["operationId"] == "listItems"
+
+
+def test_is_up_to_date_compares_output_against_inputs(tmp_path: Path):
+    """Outputs are fresh only when they exist and are no older than every input."""
+    spec_path = tmp_path / "spec.json"
+    whitelist_path = tmp_path / "whitelist.json"
+    output = tmp_path / "generated_xsiam_tools.py"
+    for path in (spec_path, whitelist_path):
+        path.write_bytes(b"{}")
+        os.utime(path, ns=(1_000, 1_000))
+
+    assert not is_up_to_date(output, [spec_path, whitelist_path])
+
+    output.write_bytes(b"")
+    os.utime(output, ns=(2_000, 2_000))
+    assert is_up_to_date(output, [spec_path, whitelist_path])
+
+    os.utime(whitelist_path, ns=(3_000, 3_000))
+    assert not is_up_to_date(output, [spec_path, whitelist_path])
@@ -1,27 +1,128 @@
 """Tests for the MCP server."""
 
+import io
+import re
 from pathlib import Path
 
-from server import generated_xsiam_tools as xsiam
-from server import generated_xsoar_tools as xsoar
-from server import main as server_main
+import pytest
+
+_SERVER_DIR = Path(__file__).resolve().parent.parent / "server"
+_GENERATED_PATHS = {
+    platform: _SERVER_DIR / f"generated_{platform}_tools.py" for platform in ("xsiam", "xsoar")
+}
 
 
 def test_generated_files_exist():
     """Generated registry files should exist."""
-    server_dir = Path(__file__).parent.parent / "server"
-    assert (server_dir / "generated_xsiam_tools.py").exists()
-    assert (server_dir / "generated_xsoar_tools.py").exists()
+    assert _GENERATED_PATHS["xsiam"].exists()
+    assert _GENERATED_PATHS["xsoar"].exists()
+
+
+# Keys may be single-quoted (raw generator output) or double-quoted (after black)
+_REGISTERED_TOOL = re.compile(r"""^TOOL_HANDLERS\[['"](\w+)['"]\]""", re.M)
+
+
+@pytest.fixture(scope="session")
+def generated_tool_names():
+    """Read each generated registry once and collect its registered tool names."""
+    return {
+        platform: set(_REGISTERED_TOOL.findall(path.read_text()))
+        for platform, path in _GENERATED_PATHS.items()
+    }
+
+
+@pytest.mark.parametrize(
+    "platform,tool_name",
+    [
+        ("xsiam", "xsiam_get_alerts"),
+        ("xsiam", "xsiam_get_incident_extra_data"),
+        ("xsoar", "xsoar_create_incidents_batch"),
+        ("xsoar", "xsoar_indicators_search"),
+    ],
+)
+def test_generated_files_content(generated_tool_names, platform, tool_name):
+    """Generated registries should register the whitelisted platform tools."""
+    assert tool_name in generated_tool_names[platform]
+
+
+@pytest.mark.parametrize("platform", ["xsiam", "xsoar"])
+def test_snake_case_naming(generated_tool_names, platform):
+    """Registered tool names should be platform-prefixed snake_case."""
+    pattern = re.compile(rf"{platform}_[a-z0-9_]+")
+    assert generated_tool_names[platform]
+    assert {name for name in generated_tool_names[platform] if not pattern.fullmatch(name)} == set()
 
 
 def test_registries_non_empty():
     """Generated registries should not be empty."""
+    from server import generated_xsiam_tools as xsiam
+    from server import generated_xsoar_tools as xsoar
+
     assert xsiam.TOOL_HANDLERS and xsiam.TOOL_SCHEMAS
     assert xsoar.TOOL_HANDLERS and xsoar.TOOL_SCHEMAS
 
 
 def test_server_merges_registries():
     """Server merge should expose combined tool count."""
+    from server import main as server_main
+
     handlers, schemas, descs = server_main._merge_registries()
     assert len(handlers) > 0
     assert set(handlers.keys()) == set(schemas.keys()) == set(descs.keys())
+
+
+def test_snapshot_docs_serves_text_read_at_discovery(tmp_path):
+    """Doc text and size should come from the startup snapshot, unaffected by later edits."""
+    from server import main as server_main
+
+    (tmp_path / "xsiam").mkdir()
+    doc = tmp_path / "xsiam" / "alerts.md"
+    doc.write_text("first", encoding="utf-8")
+
+    docs = server_main._snapshot_docs(tmp_path)
+    doc.write_text("second, longer", encoding="utf-8")
+    assert docs == {"cortexsynapse-docs://xsiam/alerts.md": (doc, "first", 5)}
+
+
+def test_walk_markdown_finds_nested_docs(tmp_path):
+    """Docs discovery should recurse into subdirectories and skip non-markdown files."""
+    from server import main as server_main
+
+    (tmp_path / "xsiam").mkdir()
+    (tmp_path / "README.md").write_text("# Index")
+    (tmp_path / "xsiam" / "alerts.md").write_text("# Alerts")
+    (tmp_path / "xsiam" / "notes.txt").write_text("ignored")
+
+    found = {
+        Path(e.path).relative_to(tmp_path).as_posix() for e in server_main._walk_markdown(tmp_path)
+    }
+    assert found == {"README.md", "xsiam/alerts.md"}
+
+
+def test_log_falls_back_to_text_stderr(monkeypatch):
+    """Log lines should still be written when stderr has no binary buffer."""
+    from server import main as server_main
+
+    stream = io.StringIO()
+    monkeypatch.setenv("CORTEXSYNAPSE_ENABLE_LOGGING", "1")
+    monkeypatch.setattr(server_main.sys, "stderr", stream)
+
+    server_main._log("x", a=1)
+    assert stream.getvalue() == '{"event":"x","a":1}\n'
+
+
+def test_log_writes_orjson_to_stderr_buffer(monkeypatch):
+    """With orjson available, log lines should go to the binary buffer in the same format."""
+    from server import main as server_main
+
+    if server_main.orjson is None:
+        pytest.skip("orjson not installed")
+
+    raw = io.BytesIO()
+    stream = io.TextIOWrapper(raw, encoding="utf-8")
+    monkeypatch.setenv("CORTEXSYNAPSE_ENABLE_LOGGING", "1")
+    monkeypatch.setattr(server_main.sys, "stderr", stream)
+
+    stream.write("before\n")
+    server_main._log("x", a=1)
+    assert raw.getvalue() == b'before\n{"event":"x","a":1}\n'